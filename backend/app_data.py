@@ -4,6 +4,9 @@ Enhanced permission database with comprehensive risk analysis
 Includes permission metadata, categories, risk levels, and historical tracking
 """
 
+import sys
+from types import MappingProxyType
+
 # Permission metadata with risk classification and descriptions
 PERMISSION_METADATA = {
     # System Permissions
@@ -411,3 +414,60 @@ TRUSTED_PUBLISHERS = [
     "meta",
     "whatsapp"
 ]
+
+# Intern permission names so lookups against PERMISSION_METADATA compare
+# by identity; request handlers intern incoming names the same way.
+# Descriptions are interned too, since every report record repeats them.
+PERMISSION_METADATA = {
+    sys.intern(name): {**meta, "description": sys.intern(meta["description"])} if "description" in meta else meta
+    for name, meta in PERMISSION_METADATA.items()
+}
+
+# Names of permissions flagged dangerous, for single-hash membership tests
+DANGEROUS_PERMS = frozenset(p for p, meta in PERMISSION_METADATA.items() if meta.get("dangerous", False))
+
+
+def _normalize_app_entry(entry) -> dict:
+    """
+    Bring an APP_PERMISSION_DATA entry into the dict format.
+    Plain permission lists become {"declared_permissions": [...]} with
+    dangerous_permissions derived from PERMISSION_METADATA.
+    """
+    if isinstance(entry, list):
+        entry = {
+            "declared_permissions": entry,
+            "dangerous_permissions": [p for p in entry if p in DANGEROUS_PERMS]
+        }
+    # Repeated names are dropped (first occurrence wins) so nothing downstream double-counts
+    return {
+        **entry,
+        "declared_permissions": list(dict.fromkeys(sys.intern(p) for p in entry.get("declared_permissions", []))),
+        "dangerous_permissions": list(dict.fromkeys(sys.intern(p) for p in entry.get("dangerous_permissions", [])))
+    }
+
+
+# Every entry is normalized once here so consumers can always read
+# APP_PERMISSION_DATA[name]["declared_permissions"] without type checks.
+APP_PERMISSION_DATA = {
+    app_name: _normalize_app_entry(entry)
+    for app_name, entry in APP_PERMISSION_DATA.items()
+}
+
+
+def freeze(value):
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+# The tables above are read-only at runtime; freeze them so nothing can
+# mutate shared state and derived tables built from them stay valid.
+PERMISSION_METADATA = freeze(PERMISSION_METADATA)
+PERMISSION_CATEGORIES = freeze(PERMISSION_CATEGORIES)
+APP_PERMISSION_DATA = freeze(APP_PERMISSION_DATA)
+PERMISSION_CORRELATIONS = freeze(PERMISSION_CORRELATIONS)
+RISK_THRESHOLDS = freeze(RISK_THRESHOLDS)
+TRUSTED_PUBLISHERS = frozenset(TRUSTED_PUBLISHERS)
@@ -1,18 +1,39 @@
 # main.py
-from fastapi import FastAPI, HTTPException, Depends
+import asyncio
+import hashlib
+import sys
+from collections import Counter, defaultdict
+
+import orjson
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+from typing import Annotated, Optional
 from urllib.parse import urlparse, parse_qs
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
 
 from database import get_db, create_tables, App, AppPermission, PermissionMeta, PackageAlias
-from risk_engine import calculate_risk, PermissionAnalyzer
+from risk_engine import calculate_risk, get_analyzer, PermissionAnalyzer
 from app_data import PERMISSION_METADATA, PERMISSION_CATEGORIES
 
 create_tables()
 
-app = FastAPI(title="SafeDroid – App Risk Analyzer", version="3.1.0")
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib json module"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(
+    title="SafeDroid – App Risk Analyzer",
+    version="3.1.0",
+    default_response_class=ORJSONResponse
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,16 +42,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (/permissions, /bulk-analyze, /analyze)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # ── Pydantic models ────────────────────────────────────────────────────────────
 
 class AppScanRequest(BaseModel):
     app_name: str = Field(..., description="Name of the app to scan")
 
+# Bounded item/list sizes let pydantic-core reject oversized payloads
+# before any per-item work happens.
+MAX_LIST_ITEMS = 1000
+PermissionName = Annotated[str, StringConstraints(min_length=1, max_length=128)]
+AppName        = Annotated[str, StringConstraints(min_length=1, max_length=128)]
+
 class PermissionListRequest(BaseModel):
-    permissions: List[str] = Field(..., description="List of permission names to analyze")
+    model_config = ConfigDict(str_strip_whitespace=True)
+    permissions: list[PermissionName] = Field(..., max_length=MAX_LIST_ITEMS, description="List of permission names to analyze")
 
 class BulkScanRequest(BaseModel):
-    app_names: List[str] = Field(..., description="List of app names to scan")
+    model_config = ConfigDict(str_strip_whitespace=True)
+    app_names: list[AppName] = Field(..., max_length=MAX_LIST_ITEMS, description="List of app names to scan")
 
 class SearchRequest(BaseModel):
     query: str = Field(..., description="App name or Play Store URL")
@@ -129,6 +161,10 @@ PERMISSION_LABEL_MAP = {
 }
 
 
+# Frozen set of scoreable permission names for the normalizer's membership tests
+KNOWN_PERMISSIONS = frozenset(PERMISSION_METADATA)
+
+
 def normalize_permissions(raw_permissions: list) -> list:
     """
     Converts raw Play Store permission strings (any format) into
@@ -150,7 +186,7 @@ def normalize_permissions(raw_permissions: list) -> list:
 
         # 1. Already correct format — exact uppercase match
         upper = raw.upper().replace("ANDROID.PERMISSION.", "")
-        if upper in PERMISSION_METADATA and upper not in seen:
+        if upper in KNOWN_PERMISSIONS and upper not in seen:
             normalized.append(upper)
             seen.add(upper)
             continue
@@ -168,7 +204,7 @@ def normalize_permissions(raw_permissions: list) -> list:
                     .replace("android.permission.", "")
                     .replace("com.google.android.c2dm.permission.", "")
                     .upper())
-        if stripped in PERMISSION_METADATA and stripped not in seen:
+        if stripped in KNOWN_PERMISSIONS and stripped not in seen:
             normalized.append(stripped)
             seen.add(stripped)
             continue
@@ -260,7 +296,26 @@ def get_app_permissions_from_db(app_name: str, db: Session):
     app_row = db.query(App).filter(App.name.ilike(app_name)).first()
     if not app_row:
         return None
-    return [p.permission_name for p in app_row.permissions]
+    # Repeats are dropped here so counts in responses match what gets scored
+    return list(dict.fromkeys(sys.intern(p.permission_name) for p in app_row.permissions))
+
+
+def get_permissions_for_apps(app_names: list, db: Session) -> dict:
+    """
+    Loads permissions for many apps with one query instead of one per app.
+    Returns {lowercased app name: [permissions]} for the names that exist,
+    with repeated permissions dropped.
+    """
+    # SQLite's lower() only folds ASCII, so match on both spellings
+    wanted = set(app_names) | {n.lower() for n in app_names}
+    rows = (db.query(App)
+              .options(selectinload(App.permissions))
+              .filter(func.lower(App.name).in_(wanted))
+              .all())
+    return {
+        a.name.lower(): list(dict.fromkeys(sys.intern(p.permission_name) for p in a.permissions))
+        for a in rows
+    }
 
 
 def extract_package_id(query: str):
@@ -355,6 +410,47 @@ def resolve_query_to_app_name(query: str, db: Session):
     return None
 
 
+# ── Pre-serialized responses ───────────────────────────────────────────────────
+# The permission catalog is static, so it is encoded to JSON once at startup
+# instead of on every request, together with a weak ETag for the body.
+
+def encode_with_etag(content) -> tuple:
+    """Encodes content to JSON bytes and returns (body, etag)"""
+    # The catalog tables are read-only mappings; default=dict encodes them
+    body = orjson.dumps(content, default=dict)
+    # Weak tag: GZipMiddleware may send the same JSON gzip-encoded or not,
+    # and a strong tag must differ between those representations
+    return body, f'W/"{hashlib.sha256(body).hexdigest()}"'
+
+
+def etag_response(request: Request, body: bytes, etag: str, cache_control: str = "public, max-age=300") -> Response:
+    """
+    Returns the JSON body with its ETag, or an empty 304 when the client's
+    If-None-Match already names this ETag. If-None-Match uses weak
+    comparison (RFC 9110), so W/ prefixes are ignored and "*" always matches.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    opaque = etag.removeprefix("W/")
+    for tag in request.headers.get("if-none-match", "").split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+PERMISSIONS_BY_CATEGORY = defaultdict(dict)
+for _name, _meta in PERMISSION_METADATA.items():
+    PERMISSIONS_BY_CATEGORY[_meta.get("category")][_name] = _meta
+
+PERMISSIONS_JSON, PERMISSIONS_ETAG = encode_with_etag(PERMISSION_METADATA)
+# category -> (body, etag)
+PERMISSIONS_BY_CATEGORY_JSON = {
+    category: encode_with_etag({"category": category, "permissions": PERMISSIONS_BY_CATEGORY[category]})
+    for category in PERMISSION_CATEGORIES
+}
+PERMISSION_CATEGORIES_JSON, PERMISSION_CATEGORIES_ETAG = encode_with_etag(PERMISSION_CATEGORIES)
+
+
 # ── Endpoints ──────────────────────────────────────────────────────────────────
 
 @app.get("/health")
@@ -375,10 +471,39 @@ def health_check(db: Session = Depends(get_db)):
     }
 
 
+# (catalog version, (body, etag)) for the last /apps response built
+_apps_cache = (None, None)
+
+
+def get_apps_payload(db: Session) -> tuple:
+    """
+    Returns the encoded /apps list and its ETag.
+    The list is rebuilt only when the catalog version (app count, highest
+    id) changes, i.e. after a live fetch inserted a new app. Checking it
+    costs one aggregate query and stays correct across worker processes.
+    """
+    global _apps_cache
+    version = tuple(db.query(func.count(App.id), func.max(App.id)).one())
+    cached_version, payload = _apps_cache
+    if cached_version != version:
+        rows = (db.query(App.name, App.version, func.count(func.distinct(AppPermission.permission_name)))
+                  .outerjoin(App.permissions)
+                  .group_by(App.id)
+                  .order_by(App.name)
+                  .all())
+        payload = encode_with_etag([
+            {"name": name, "version": app_version or "Unknown", "permissions_count": count}
+            for name, app_version, count in rows
+        ])
+        _apps_cache = (version, payload)
+    return payload
+
+
 @app.get("/apps")
-def get_available_apps(db: Session = Depends(get_db)):
-    apps = db.query(App).order_by(App.name).all()
-    return [{"name": a.name, "version": a.version or "Unknown", "permissions_count": len(a.permissions)} for a in apps]
+def get_available_apps(request: Request, db: Session = Depends(get_db)):
+    body, etag = get_apps_payload(db)
+    # Live fetches add apps, so clients must revalidate instead of caching
+    return etag_response(request, body, etag, cache_control="no-cache")
 
 
 @app.post("/search")
@@ -452,43 +577,38 @@ def scan_app(data: AppScanRequest, db: Session = Depends(get_db)):
 
 
 @app.post("/analyze")
-def analyze_app_endpoint(data: AppScanRequest, db: Session = Depends(get_db)):
+def analyze_app_endpoint(data: AppScanRequest, db: Session = Depends(get_db),
+                         analyzer: PermissionAnalyzer = Depends(get_analyzer)):
     permissions = get_app_permissions_from_db(data.app_name, db)
     if permissions is None:
         raise HTTPException(status_code=404, detail="App not found in database")
 
-    analyzer             = PermissionAnalyzer()
-    severity_analysis    = analyzer.calculate_severity_score(permissions)
-    correlation_analysis = analyzer.detect_permission_correlations(permissions)
-    privacy_analysis     = analyzer.analyze_privacy_impact(permissions)
-    categorized          = analyzer.categorize_permissions(permissions)
-    total_score          = severity_analysis["total_score"]
-    risk_level           = analyzer.calculate_risk_level(total_score)
+    profile = analyzer.app_profile(permissions)
 
     return {
         "app_name":   data.app_name,
-        "risk_score": total_score,
-        "risk_level": risk_level,
+        "risk_score": profile["risk_score"],
+        "risk_level": profile["risk_level"],
         "permission_analysis": {
             "total_declared":     len(permissions),
-            "severity_breakdown": severity_analysis["severity_breakdown"],
-            "category_scores":    severity_analysis["category_scores"]
+            "severity_breakdown": profile["severity"]["severity_breakdown"],
+            "category_scores":    profile["severity"]["category_scores"]
         },
-        "privacy_analysis":        privacy_analysis,
-        "categorized_permissions": categorized,
-        "correlation_analysis":    correlation_analysis,
+        "privacy_analysis":        profile["privacy"],
+        "categorized_permissions": profile["categorized"],
+        "correlation_analysis":    profile["correlations"],
         "source": "database"
     }
 
 
 @app.post("/detect-threats")
-def detect_threats(data: AppScanRequest, db: Session = Depends(get_db)):
+def detect_threats(data: AppScanRequest, db: Session = Depends(get_db),
+                   analyzer: PermissionAnalyzer = Depends(get_analyzer)):
     permissions = get_app_permissions_from_db(data.app_name, db)
     if permissions is None:
         raise HTTPException(status_code=404, detail="App not found in database")
 
-    analyzer     = PermissionAnalyzer()
-    correlations = analyzer.detect_permission_correlations(permissions)
+    correlations = analyzer.app_profile(permissions)["correlations"]
     indicators   = {
         "privilege_escalation":   "DEVICE_ADMIN" in permissions,
         "data_exfiltration_risk": "CRITICAL" if len(permissions) > 15 else "HIGH" if len(permissions) > 10 else "MEDIUM",
@@ -505,42 +625,49 @@ def detect_threats(data: AppScanRequest, db: Session = Depends(get_db)):
 
 
 @app.post("/bulk-analyze")
-def bulk_analyze(data: BulkScanRequest, db: Session = Depends(get_db)):
-    results  = []
-    analyzer = PermissionAnalyzer()
-    for app_name in data.app_names:
-        permissions = get_app_permissions_from_db(app_name, db)
-        if permissions is not None:
-            severity   = analyzer.calculate_severity_score(permissions)
-            risk_level = analyzer.calculate_risk_level(severity["total_score"])
-            results.append({"app_name": app_name, "risk_score": severity["total_score"], "risk_level": risk_level, "permission_count": len(permissions)})
-
-    if not results:
+async def bulk_analyze(data: BulkScanRequest, db: Session = Depends(get_db),
+                       analyzer: PermissionAnalyzer = Depends(get_analyzer)):
+    found = await asyncio.to_thread(get_permissions_for_apps, data.app_names, db)
+    if not found:
         raise HTTPException(status_code=404, detail="No valid apps found")
 
-    avg_score   = sum(r["risk_score"] for r in results) / len(results)
-    risk_levels = [r["risk_level"] for r in results]
+    # Profile the whole batch in one trip off the event loop; per-app threads
+    # would only add overhead since cached profiles return in microseconds
+    valid    = [n for n in data.app_names if n.lower() in found]
+    profiles = await asyncio.to_thread(lambda: [analyzer.app_profile(found[n.lower()]) for n in valid])
+
+    results     = []
+    total_score = 0
+    risk_levels = Counter()
+    for app_name, profile in zip(valid, profiles):
+        results.append({"app_name": app_name, "risk_score": profile["risk_score"], "risk_level": profile["risk_level"], "permission_count": len(found[app_name.lower()])})
+        total_score += profile["risk_score"]
+        risk_levels[profile["risk_level"]] += 1
+
+    avg_score = total_score / len(results)
     return {
         "total_apps_analyzed": len(results),
         "average_risk_score":  round(avg_score, 2),
-        "risk_level_distribution": {"CRITICAL": risk_levels.count("CRITICAL"), "HIGH": risk_levels.count("HIGH"), "MEDIUM": risk_levels.count("MEDIUM"), "LOW": risk_levels.count("LOW")},
+        "risk_level_distribution": {level: risk_levels[level] for level in ("CRITICAL", "HIGH", "MEDIUM", "LOW")},
         "apps":   results,
         "source": "database"
     }
 
 
 @app.post("/compare")
-def compare_apps(data: BulkScanRequest, db: Session = Depends(get_db)):
+async def compare_apps(data: BulkScanRequest, db: Session = Depends(get_db),
+                       analyzer: PermissionAnalyzer = Depends(get_analyzer)):
     if len(data.app_names) < 2:
         raise HTTPException(status_code=400, detail="Provide at least 2 apps")
 
-    analyzer  = PermissionAnalyzer()
-    apps_data = []
-    for app_name in data.app_names:
-        permissions = get_app_permissions_from_db(app_name, db)
-        if permissions:
-            severity = analyzer.calculate_severity_score(permissions)
-            apps_data.append({"app_name": app_name, "risk_score": severity["total_score"], "permission_count": len(permissions), "dangerous_count": severity["critical_count"] + severity["dangerous_count"]})
+    found    = await asyncio.to_thread(get_permissions_for_apps, data.app_names, db)
+    valid    = [n for n in data.app_names if found.get(n.lower())]
+    profiles = await asyncio.to_thread(lambda: [analyzer.app_profile(found[n.lower()]) for n in valid])
+
+    apps_data = [
+        {"app_name": app_name, "risk_score": profile["risk_score"], "permission_count": len(found[app_name.lower()]), "dangerous_count": profile["dangerous_count"]}
+        for app_name, profile in zip(valid, profiles)
+    ]
 
     if not apps_data:
         raise HTTPException(status_code=404, detail="No valid apps found")
@@ -554,15 +681,15 @@ def compare_apps(data: BulkScanRequest, db: Session = Depends(get_db)):
 
 
 @app.get("/permissions")
-def get_permissions(category: Optional[str] = None):
+def get_permissions(request: Request, category: Optional[str] = None):
     if category:
         if category not in PERMISSION_CATEGORIES:
             raise HTTPException(status_code=400, detail=f"Invalid category: {category}")
-        filtered = {p: m for p, m in PERMISSION_METADATA.items() if m.get("category") == category}
-        return {"category": category, "permissions": filtered}
-    return PERMISSION_METADATA
+        body, etag = PERMISSIONS_BY_CATEGORY_JSON[category]
+        return etag_response(request, body, etag)
+    return etag_response(request, PERMISSIONS_JSON, PERMISSIONS_ETAG)
 
 
 @app.get("/permission-categories")
-def get_permission_categories():
-    return PERMISSION_CATEGORIES
+def get_permission_categories(request: Request):
+    return etag_response(request, PERMISSION_CATEGORIES_JSON, PERMISSION_CATEGORIES_ETAG)
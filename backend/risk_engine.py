@@ -5,16 +5,156 @@ Provides sophisticated permission analysis with correlation detection,
 threat indicators, and comprehensive risk scoring
 """
 
+import os
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+from dataclasses import dataclass
+from functools import lru_cache, reduce
+from operator import or_
+from types import MappingProxyType
+
 from app_data import (
     PERMISSION_METADATA,
     PERMISSION_CATEGORIES,
     APP_PERMISSION_DATA,
     PERMISSION_CORRELATIONS,
     RISK_THRESHOLDS,
-    TRUSTED_PUBLISHERS
+    TRUSTED_PUBLISHERS,
+    DANGEROUS_PERMS,
+    freeze
+)
+
+
+# Severity per known permission, for calculate_risk's plain sum
+SEVERITY = {name: meta.get("severity", 0) for name, meta in PERMISSION_METADATA.items()}
+
+
+def _dedupe(permissions) -> tuple:
+    """Permissions with repeats dropped, keeping first-seen order"""
+    return tuple(dict.fromkeys(permissions))
+
+
+# Permission combinations reported as suspicious patterns; a pattern
+# matches when the app declares every permission in it
+SUSPICIOUS_PATTERNS = (
+    (("SMS", "CALL_PHONE"),
+     "App can intercept SMS and make calls - VERY SUSPICIOUS"),
+    (("DEVICE_ADMIN",),
+     "Device admin access requested - CRITICAL THREAT"),
+    (("READ_CONTACTS", "READ_SMS", "CALL_LOG"),
+     "Full communication profile access - EXTREME DATA COLLECTION"),
+    (("CAMERA", "MICROPHONE", "ACCESS_FINE_LOCATION"),
+     "Complete surveillance capability detected")
+)
+
+# Bitmask encoding for set-style checks: each tracked permission owns one
+# bit, so an app's permission set packs into a single int and membership,
+# correlation and pattern checks become AND / bit_count operations.
+PERM_BIT = {
+    name: 1 << i
+    for i, name in enumerate(dict.fromkeys([
+        *PERMISSION_METADATA,
+        *PERMISSION_CORRELATIONS,
+        *(p for related in PERMISSION_CORRELATIONS.values() for p in related),
+        *(p for perms, _ in SUSPICIOUS_PATTERNS for p in perms)
+    ]))
+}
+CORRELATION_MASKS = {
+    primary: reduce(or_, (PERM_BIT[p] for p in related), 0)
+    for primary, related in PERMISSION_CORRELATIONS.items()
+}
+# Related permissions per primary with their bits pre-resolved, and the
+# union of all primaries so apps declaring none can skip the loop
+CORRELATED_BITS = {
+    primary: tuple((p, PERM_BIT[p]) for p in related)
+    for primary, related in PERMISSION_CORRELATIONS.items()
+}
+PRIMARY_MASK = reduce(or_, (PERM_BIT[p] for p in PERMISSION_CORRELATIONS), 0)
+PATTERN_MASKS = tuple(
+    (reduce(or_, (PERM_BIT[p] for p in perms), 0), message)
+    for perms, message in SUSPICIOUS_PATTERNS
 )
 
 
+def permission_mask(permissions) -> int:
+    """Pack a permission list into its bitmask; unknown permissions are ignored"""
+    return reduce(or_, (PERM_BIT.get(p, 0) for p in permissions), 0)
+
+
+# Per-permission records inside cached profiles and reports. They are
+# slotted and frozen like the rest of a cached report; FastAPI's encoder
+# turns them into plain dicts at the JSON boundary. The public analysis
+# methods return fresh, JSON-ready dicts via to_dict().
+@dataclass(slots=True, frozen=True)
+class PermRecord:
+    permission: str
+    severity: int
+    description: str
+
+    def to_dict(self) -> dict:
+        return {"permission": self.permission, "severity": self.severity, "description": self.description}
+
+
+@dataclass(slots=True, frozen=True)
+class PrivacyRecord:
+    permission: str
+    description: str
+    can_access: tuple
+
+    def to_dict(self) -> dict:
+        return {"permission": self.permission, "description": self.description, "can_access": list(self.can_access)}
+
+
+@dataclass(slots=True, frozen=True)
+class CategoryRecord:
+    name: str
+    severity: int
+    risk_level: str
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "severity": self.severity, "risk_level": self.risk_level}
+
+
+# Everything the dict-walking analyses read about one permission, so each
+# walk does a single lookup per name. The records are shared: they are
+# frozen and depend only on the permission.
+_PermRow = namedtuple("_PermRow", [
+    "severity", "category", "category_name", "tier", "privacy_impact", "can_access",
+    "dangerous", "severity_record", "privacy_record", "category_record"
+])
+
+
+def _perm_row(name: str, meta) -> _PermRow:
+    severity = meta.get("severity", 0)
+    category = meta.get("category", "UNKNOWN")
+    description = meta.get("description", "")
+    can_access = meta.get("can_access", ())
+    if severity >= 8:
+        tier = "critical"
+    elif severity >= 5:
+        tier = "dangerous"
+    else:
+        tier = "normal"
+    return _PermRow(
+        severity=severity,
+        category=category,
+        category_name=PERMISSION_CATEGORIES.get(category, {}).get("name", category),
+        tier=tier,
+        privacy_impact=meta.get("privacy_impact", "LOW"),
+        can_access=frozenset(can_access),
+        dangerous=meta.get("dangerous", False),
+        severity_record=PermRecord(name, severity, description),
+        privacy_record=PrivacyRecord(name, description, can_access),
+        category_record=CategoryRecord(name, severity, meta["risk_level"])
+    )
+
+
+PERM_ROWS = {name: _perm_row(name, meta) for name, meta in PERMISSION_METADATA.items()}
+
+# Sections the profile builder needs, gathered by _full_pass in one walk
+_FullPassResult = namedtuple("_FullPassResult", ["severity", "privacy", "categorized", "dangerous_count"])
+
+
 class PermissionAnalyzer:
     """Advanced permission analyzer with complex risk evaluation"""
     
@@ -23,6 +163,20 @@ class PermissionAnalyzer:
         self.permission_categories = PERMISSION_CATEGORIES
         self.permission_correlations = PERMISSION_CORRELATIONS
         self.risk_thresholds = RISK_THRESHOLDS
+        
+        # Normalize thresholds (dict or tuple format) into parallel tuples sorted by upper bound
+        bounds = []
+        for level, threshold in self.risk_thresholds.items():
+            if isinstance(threshold, (dict, MappingProxyType)):
+                bounds.append((threshold.get("max", 100), threshold.get("min", 0), level))
+            else:
+                bounds.append((threshold[1], threshold[0], level))
+        bounds.sort(key=lambda bound: bound[0])
+        self._upper = tuple(hi for hi, _, _ in bounds)
+        self._lower = tuple(lo for _, lo, _ in bounds)
+        self._levels = tuple(level for _, _, level in bounds)
+        self._cached_profile = lru_cache(maxsize=1024)(self._build_app_profile)
+        self._cached_report = lru_cache(maxsize=1024)(self._compute_comprehensive)
     
     def calculate_severity_score(self, permissions: list) -> dict:
         """
@@ -34,47 +188,24 @@ class PermissionAnalyzer:
         Returns:
             Dict with total_score, category_scores, severity_breakdown
         """
+        rows = PERM_ROWS
         total_score = 0
-        category_scores = {}
-        severity_breakdown = {
-            "critical": [],
-            "dangerous": [],
-            "normal": []
-        }
-        
-        for perm in permissions:
-            if perm in self.permission_metadata:
-                meta = self.permission_metadata[perm]
-                severity = meta.get("severity", 0)
-                category = meta.get("category", "UNKNOWN")
-                
-                total_score += severity
-                
-                # Track category scores
-                if category not in category_scores:
-                    category_scores[category] = 0
-                category_scores[category] += severity
-                
-                # Breakdown by severity
-                if severity >= 8:
-                    severity_breakdown["critical"].append({
-                        "permission": perm,
-                        "severity": severity,
-                        "description": meta.get("description", "")
-                    })
-                elif severity >= 5:
-                    severity_breakdown["dangerous"].append({
-                        "permission": perm,
-                        "severity": severity,
-                        "description": meta.get("description", "")
-                    })
-                else:
-                    severity_breakdown["normal"].append({
-                        "permission": perm,
-                        "severity": severity,
-                        "description": meta.get("description", "")
-                    })
-        
+        category_scores = defaultdict(int)
+        severity_breakdown = {"critical": [], "dangerous": [], "normal": []}
+        
+        for perm in _dedupe(permissions):
+            row = rows.get(perm)
+            if row is None:
+                continue
+            severity = row.severity
+            total_score += severity
+            category_scores[row.category] += severity
+            severity_breakdown[row.tier].append(row.severity_record.to_dict())
+        
+        return self._severity_result(total_score, dict(category_scores), severity_breakdown)
+    
+    @staticmethod
+    def _severity_result(total_score: int, category_scores: dict, severity_breakdown: dict) -> dict:
         return {
             "total_score": total_score,
             "category_scores": category_scores,
@@ -94,15 +225,19 @@ class PermissionAnalyzer:
         Returns:
             Dict with detected correlations and risk patterns
         """
+        permissions = _dedupe(permissions)
+        return self._correlations_from(permissions, permission_mask(permissions))
+    
+    def _correlations_from(self, permissions, app_mask: int) -> dict:
         correlations = []
         suspicious_patterns = []
         
-        for perm in permissions:
-            if perm in self.permission_correlations:
-                related_perms = self.permission_correlations[perm]
-                found_related = [p for p in related_perms if p in permissions]
-                
-                if found_related:
+        if app_mask & PRIMARY_MASK:
+            correlation_mask, correlated_bits = CORRELATION_MASKS.get, CORRELATED_BITS
+            for perm in permissions:
+                # A non-zero AND means at least one related permission is present
+                if app_mask & correlation_mask(perm, 0):
+                    found_related = [p for p, bit in correlated_bits[perm] if app_mask & bit]
                     correlations.append({
                         "primary": perm,
                         "correlated": found_related,
@@ -110,21 +245,9 @@ class PermissionAnalyzer:
                     })
         
         # Detect suspicious patterns
-        if "SMS" in permissions and "CALL_PHONE" in permissions:
-            suspicious_patterns.append("App can intercept SMS and make calls - VERY SUSPICIOUS")
-        
-        if "DEVICE_ADMIN" in permissions:
-            suspicious_patterns.append("Device admin access requested - CRITICAL THREAT")
-        
-        if ("READ_CONTACTS" in permissions and 
-            "READ_SMS" in permissions and 
-            "CALL_LOG" in permissions):
-            suspicious_patterns.append("Full communication profile access - EXTREME DATA COLLECTION")
-        
-        if ("CAMERA" in permissions and 
-            "MICROPHONE" in permissions and 
-            "ACCESS_FINE_LOCATION" in permissions):
-            suspicious_patterns.append("Complete surveillance capability detected")
+        for pattern_mask, message in PATTERN_MASKS:
+            if app_mask & pattern_mask == pattern_mask:
+                suspicious_patterns.append(message)
         
         return {
             "correlations": correlations,
@@ -142,28 +265,21 @@ class PermissionAnalyzer:
         Returns:
             Dict with privacy impact analysis
         """
-        privacy_impacts = {
-            "CRITICAL": [],
-            "HIGH": [],
-            "MEDIUM": [],
-            "LOW": []
-        }
-        
+        rows = PERM_ROWS
+        privacy_impacts = {"CRITICAL": [], "HIGH": [], "MEDIUM": [], "LOW": []}
         affected_data_types = set()
         
-        for perm in permissions:
-            if perm in self.permission_metadata:
-                meta = self.permission_metadata[perm]
-                impact = meta.get("privacy_impact", "LOW")
-                
-                privacy_impacts[impact].append({
-                    "permission": perm,
-                    "description": meta.get("description", ""),
-                    "can_access": meta.get("can_access", [])
-                })
-                
-                affected_data_types.update(meta.get("can_access", []))
+        for perm in _dedupe(permissions):
+            row = rows.get(perm)
+            if row is None:
+                continue
+            privacy_impacts[row.privacy_impact].append(row.privacy_record.to_dict())
+            affected_data_types |= row.can_access
         
+        return self._privacy_result(privacy_impacts, affected_data_types)
+    
+    @staticmethod
+    def _privacy_result(privacy_impacts: dict, affected_data_types: set) -> dict:
         return {
             "privacy_impacts": privacy_impacts,
             "affected_data_types": list(affected_data_types),
@@ -181,23 +297,17 @@ class PermissionAnalyzer:
         Returns:
             Dict with categorized permissions
         """
+        rows = PERM_ROWS
         categorized = {}
         
-        for perm in permissions:
-            if perm in self.permission_metadata:
-                category = self.permission_metadata[perm]["category"]
-                
-                if category not in categorized:
-                    categorized[category] = {
-                        "name": self.permission_categories[category]["name"],
-                        "permissions": []
-                    }
-                
-                categorized[category]["permissions"].append({
-                    "name": perm,
-                    "severity": self.permission_metadata[perm]["severity"],
-                    "risk_level": self.permission_metadata[perm]["risk_level"]
-                })
+        for perm in _dedupe(permissions):
+            row = rows.get(perm)
+            if row is None:
+                continue
+            entry = categorized.get(row.category)
+            if entry is None:
+                entry = categorized[row.category] = {"name": row.category_name, "permissions": []}
+            entry["permissions"].append(row.category_record.to_dict())
         
         return categorized
     
@@ -211,16 +321,114 @@ class PermissionAnalyzer:
         Returns:
             Risk level string (LOW, MEDIUM, HIGH, CRITICAL)
         """
-        for level, threshold in self.risk_thresholds.items():
-            # Handle both dict and tuple formats
-            if isinstance(threshold, dict):
-                if threshold.get("min", 0) <= score <= threshold.get("max", 100):
-                    return level
-            elif isinstance(threshold, tuple):
-                if threshold[0] <= score <= threshold[1]:
-                    return level
+        levels = self._levels
+        idx = bisect_left(self._upper, score)
+        # Scores past the last bound or falling in a gap between levels are CRITICAL
+        if idx < len(levels) and score >= self._lower[idx]:
+            return levels[idx]
         return "CRITICAL"
     
+    def _full_pass(self, permissions) -> _FullPassResult:
+        """
+        One walk over permissions building the severity, privacy and
+        category sections together; only the profile builder needs all three
+        """
+        rows = PERM_ROWS
+        total_score = 0
+        dangerous_count = 0
+        category_scores = defaultdict(int)
+        severity_breakdown = {"critical": [], "dangerous": [], "normal": []}
+        privacy_impacts = {"CRITICAL": [], "HIGH": [], "MEDIUM": [], "LOW": []}
+        affected_data_types = set()
+        categorized = {}
+        
+        for perm in permissions:
+            row = rows.get(perm)
+            if row is None:
+                continue
+            severity, category = row.severity, row.category
+            total_score += severity
+            dangerous_count += row.dangerous
+            category_scores[category] += severity
+            severity_breakdown[row.tier].append(row.severity_record)
+            privacy_impacts[row.privacy_impact].append(row.privacy_record)
+            affected_data_types |= row.can_access
+            entry = categorized.get(category)
+            if entry is None:
+                entry = categorized[category] = {"name": row.category_name, "permissions": []}
+            entry["permissions"].append(row.category_record)
+        
+        return _FullPassResult(
+            severity=self._severity_result(total_score, dict(category_scores), severity_breakdown),
+            privacy=self._privacy_result(privacy_impacts, affected_data_types),
+            categorized=categorized,
+            dangerous_count=dangerous_count
+        )
+    
+    def _build_app_profile(self, permissions: tuple) -> MappingProxyType:
+        """Uncached body of app_profile"""
+        result = self._full_pass(permissions)
+        severity_analysis = result.severity
+        total_score = severity_analysis["total_score"]
+        mask = permission_mask(permissions)
+        correlations = self._correlations_from(permissions, mask)
+        privacy = result.privacy
+        threats = self._detect_threat_indicators_core(mask, result.dangerous_count, len(permissions))
+        
+        # Every container here was just built with a known shape, so wrap
+        # each one directly rather than walking the whole tree with freeze()
+        frozen = MappingProxyType
+        return frozen({
+            "risk_score": total_score,
+            "risk_level": self.calculate_risk_level(total_score),
+            "dangerous_count": severity_analysis["critical_count"] + severity_analysis["dangerous_count"],
+            "mask": mask,
+            "severity": frozen({
+                **severity_analysis,
+                "category_scores": frozen(severity_analysis["category_scores"]),
+                "severity_breakdown": frozen({
+                    tier: tuple(records) for tier, records in severity_analysis["severity_breakdown"].items()
+                })
+            }),
+            "correlations": frozen({
+                **correlations,
+                "correlations": tuple(
+                    frozen({**entry, "correlated": tuple(entry["correlated"])})
+                    for entry in correlations["correlations"]
+                ),
+                "suspicious_patterns": tuple(correlations["suspicious_patterns"])
+            }),
+            "privacy": frozen({
+                **privacy,
+                "privacy_impacts": frozen({
+                    level: tuple(records) for level, records in privacy["privacy_impacts"].items()
+                }),
+                "affected_data_types": tuple(privacy["affected_data_types"])
+            }),
+            "categorized": frozen({
+                category: frozen({"name": entry["name"], "permissions": tuple(entry["permissions"])})
+                for category, entry in result.categorized.items()
+            }),
+            "threats": frozen({**threats, "detected_threats": tuple(threats["detected_threats"])})
+        })
+    
+    def app_profile(self, permissions: list) -> MappingProxyType:
+        """
+        Every per-permission analysis for one permission set, computed once
+        
+        Profiles are cached by the deduplicated permission tuple, so apps
+        sharing a permission set (or the same app requested again) reuse
+        one result.
+        
+        Args:
+            permissions: List of permission strings
+            
+        Returns:
+            Frozen mapping with risk_score, risk_level, dangerous_count,
+            mask, severity, correlations, privacy, categorized and threats
+        """
+        return self._cached_profile(_dedupe(permissions))
+    
     def detect_threat_indicators(self, app_name: str) -> dict:
         """
         Detect specific threat indicators for an app
@@ -231,6 +439,16 @@ class PermissionAnalyzer:
         Returns:
             Dict with detected threat indicators
         """
+        if app_name not in APP_PERMISSION_DATA:
+            return self._detect_threat_indicators_core(0, 0, 0)
+        
+        permissions = APP_PERMISSION_DATA[app_name]["declared_permissions"]
+        dangerous_count = sum(1 for p in permissions if p in DANGEROUS_PERMS)
+        return self._detect_threat_indicators_core(permission_mask(permissions), dangerous_count, len(permissions))
+    
+    @staticmethod
+    def _detect_threat_indicators_core(mask: int, dangerous_count: int, permission_count: int) -> dict:
+        """Threat indicators from values the caller has already derived"""
         indicators = {
             "privilege_escalation": False,
             "data_exfiltration_risk": "LOW",
@@ -238,27 +456,12 @@ class PermissionAnalyzer:
             "privacy_risk": "LOW",
             "detected_threats": []
         }
-        
-        if app_name not in APP_PERMISSION_DATA:
-            return indicators
-        
-        app_data = APP_PERMISSION_DATA[app_name]
-        
-        # Handle both list and dict formats
-        if isinstance(app_data, list):
-            permissions = app_data
-            dangerous_permissions = [p for p in permissions if p in PERMISSION_METADATA and PERMISSION_METADATA[p].get("dangerous", False)]
-        else:
-            permissions = app_data.get("declared_permissions", [])
-            dangerous_permissions = app_data.get("dangerous_permissions", [])
-        
         # Check for privilege escalation
-        if "DEVICE_ADMIN" in permissions:
+        if mask & PERM_BIT["DEVICE_ADMIN"]:
             indicators["privilege_escalation"] = True
             indicators["detected_threats"].append("Device admin access")
         
         # Assess data exfiltration risk
-        dangerous_count = len(dangerous_permissions)
         if dangerous_count > 10:
             indicators["data_exfiltration_risk"] = "CRITICAL"
             indicators["detected_threats"].append("Excessive dangerous permissions")
@@ -268,23 +471,26 @@ class PermissionAnalyzer:
             indicators["data_exfiltration_risk"] = "MEDIUM"
         
         # Financial risk assessment
-        if "SEND_SMS" in permissions or "CALL_PHONE" in permissions:
+        if mask & (PERM_BIT["SEND_SMS"] | PERM_BIT["CALL_PHONE"]):
             indicators["financial_risk"] = "HIGH"
             indicators["detected_threats"].append("Can make calls or send SMS (financial risk)")
         
         # Privacy risk
-        if len(permissions) > 15:
+        if permission_count > 15:
             indicators["privacy_risk"] = "CRITICAL"
             indicators["detected_threats"].append("Unusually high number of permission requests")
-        elif len(permissions) > 10:
+        elif permission_count > 10:
             indicators["privacy_risk"] = "HIGH"
         
         return indicators
     
-    def analyze_app_comprehensive(self, app_name: str) -> dict:
+    def analyze_app_comprehensive(self, app_name: str) -> MappingProxyType:
         """
         Comprehensive app analysis using all available data
         
+        Reports are cached by app_name and returned frozen so callers
+        cannot mutate the cached copy.
+        
         Args:
             app_name: Name of the application to analyze
             
@@ -292,39 +498,33 @@ class PermissionAnalyzer:
             Complete risk analysis report
         """
         if app_name not in APP_PERMISSION_DATA:
-            return {"error": "App not found in database"}
+            return freeze({"error": "App not found in database"})
         
+        return self._cached_report(app_name)
+    
+    def _compute_comprehensive(self, app_name: str) -> MappingProxyType:
+        """Uncached body of analyze_app_comprehensive"""
         app_data = APP_PERMISSION_DATA[app_name]
-        
-        # Handle both list format and dict format
-        if isinstance(app_data, list):
-            permissions = app_data
-            version = "Unknown"
-            dangerous_permissions = [p for p in permissions if p in PERMISSION_METADATA and PERMISSION_METADATA[p].get("dangerous", False)]
-            runtime_permissions = []
-            risk_profile = {}
-            permission_justification = {}
-            historical_changes = []
-        else:
-            permissions = app_data.get("declared_permissions", [])
-            version = app_data.get("version", "Unknown")
-            dangerous_permissions = app_data.get("dangerous_permissions", [])
-            runtime_permissions = app_data.get("runtime_permissions", [])
-            risk_profile = app_data.get("risk_profile", {})
-            permission_justification = app_data.get("permission_justification", {})
-            historical_changes = app_data.get("historical_changes", [])
-        
-        # Run all analyses
-        severity_analysis = self.calculate_severity_score(permissions)
-        correlation_analysis = self.detect_permission_correlations(permissions)
-        privacy_analysis = self.analyze_privacy_impact(permissions)
-        categorized = self.categorize_permissions(permissions)
-        threat_indicators = self.detect_threat_indicators(app_name)
-        
-        total_score = severity_analysis["total_score"]
-        risk_level = self.calculate_risk_level(total_score)
-        
-        return {
+        version = app_data.get("version", "Unknown")
+        permissions = app_data["declared_permissions"]
+        dangerous_permissions = app_data["dangerous_permissions"]
+        runtime_permissions = app_data.get("runtime_permissions", [])
+        risk_profile = app_data.get("risk_profile", {})
+        permission_justification = app_data.get("permission_justification", {})
+        historical_changes = app_data.get("historical_changes", [])
+        
+        # Every analysis comes from one fused pass, shared via the profile cache
+        profile = self.app_profile(permissions)
+        severity_analysis = profile["severity"]
+        correlation_analysis = profile["correlations"]
+        privacy_analysis = profile["privacy"]
+        categorized = profile["categorized"]
+        threat_indicators = profile["threats"]
+        
+        total_score = profile["risk_score"]
+        risk_level = profile["risk_level"]
+        
+        return freeze({
             "app_name": app_name,
             "version": version,
             "risk_score": total_score,
@@ -363,46 +563,77 @@ class PermissionAnalyzer:
             
             # Threat indicators
             "threat_indicators": threat_indicators
-        }
+        })
+
+
+# Shared analyzer instance — the analyzer holds no per-request state,
+# so one instance serves the whole process.
+ANALYZER = PermissionAnalyzer()
+
+
+def get_analyzer() -> PermissionAnalyzer:
+    """
+    FastAPI dependency — returns the process-wide analyzer.
+    Usage in endpoint:  analyzer: PermissionAnalyzer = Depends(get_analyzer)
+    """
+    return ANALYZER
 
 
 # Backwards compatibility functions
-def calculate_risk(permissions: list) -> tuple:
+def calculate_risk(permissions: list, explain: bool = True) -> tuple:
     """
     Legacy function for backward compatibility
     Returns simple risk score, level, and explanations
+
+    Pass explain=False to skip building the explanation strings when only
+    score and level are used. Repeated permissions are scored once.
     """
-    analyzer = PermissionAnalyzer()
-    severity_data = analyzer.calculate_severity_score(permissions)
-    correlations = analyzer.detect_permission_correlations(permissions)
+    permissions = _dedupe(permissions)
+    severity = SEVERITY
     
-    score = severity_data["total_score"]
-    level = analyzer.calculate_risk_level(score)
+    score = sum(severity.get(p, 0) for p in permissions)
+    level = ANALYZER.calculate_risk_level(score)
     
-    explanations = []
+    if not explain or not permissions:
+        return score, level, []
     
-    # Add severity explanations
-    for perm_info in severity_data["severity_breakdown"]["critical"]:
-        explanations.append(
-            f"[CRITICAL] {perm_info['permission']}: {perm_info['description']} (Severity: {perm_info['severity']})"
-        )
+    critical = []
+    dangerous = []
     
-    for perm_info in severity_data["severity_breakdown"]["dangerous"]:
-        explanations.append(
-            f"[DANGEROUS] {perm_info['permission']}: {perm_info['description']}"
-        )
+    # Add severity explanations
+    for perm in permissions:
+        perm_severity = severity.get(perm, 0)
+        if perm_severity >= 8:
+            critical.append(
+                f"[CRITICAL] {perm}: {PERMISSION_METADATA[perm].get('description', '')} (Severity: {perm_severity})"
+            )
+        elif perm_severity >= 5:
+            dangerous.append(
+                f"[DANGEROUS] {perm}: {PERMISSION_METADATA[perm].get('description', '')}"
+            )
+    explanations = critical + dangerous
     
     # Add pattern warnings
-    for pattern in correlations["suspicious_patterns"]:
-        explanations.append(f"[PATTERN] {pattern}")
+    mask = permission_mask(permissions)
+    for pattern_mask, pattern in PATTERN_MASKS:
+        if mask & pattern_mask == pattern_mask:
+            explanations.append(f"[PATTERN] {pattern}")
     
     return score, level, explanations
 
 
-def analyze_app(app_name: str) -> dict:
+# Warm the analyzer's report cache (and with it the profile cache) for the
+# built-in catalog at import; set SAFEDROID_PREWARM=0 to build them lazily
+# on first request instead.
+if os.environ.get("SAFEDROID_PREWARM", "1") != "0":
+    for _name in APP_PERMISSION_DATA:
+        ANALYZER.analyze_app_comprehensive(_name)
+
+
+def analyze_app(app_name: str) -> MappingProxyType:
     """
     Main entry point for comprehensive app analysis
-    """
-    analyzer = PermissionAnalyzer()
-    return analyzer.analyze_app_comprehensive(app_name)
 
+    Served from the shared analyzer's report cache. Reports are frozen.
+    """
+    return ANALYZER.analyze_app_comprehensive(app_name)
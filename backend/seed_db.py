@@ -34,14 +34,14 @@ def seed():
         print(f"   ✓ {len(PERMISSION_METADATA)} permissions seeded")
 
         print("\n📱 Seeding apps...")
-        for app_name, permissions in APP_PERMISSION_DATA.items():
+        for app_name, app_data in APP_PERMISSION_DATA.items():
             exists = db.query(App).filter_by(name=app_name).first()
             if not exists:
                 app_row = App(name=app_name)
                 db.add(app_row)
                 db.flush()  # get the new app's ID
 
-                perm_list = permissions if isinstance(permissions, list) else permissions.get("declared_permissions", [])
+                perm_list = app_data["declared_permissions"]
                 for perm_name in perm_list:
                     db.add(AppPermission(
                         app_id=app_row.id,